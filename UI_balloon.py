@@ -1,5 +1,7 @@
 import streamlit as st
 
+from balloon_markup import BALLOON_HTML_DOWN, BALLOON_HTML_UP, BALLOON_STYLE
+
 st.set_page_config(page_title="Balloon Demo", layout="centered")
 
 # Initialize state
@@ -22,26 +24,10 @@ if st.button("Toggle Balloon"):
 #     st.session_state.balloon_up = False
 
 
-# Determine balloon position
-bottom_position = "250px" if st.session_state.balloon_up else "20px"
-
-# Balloon HTML + CSS
+# Balloon CSS and markup are prebuilt in balloon_markup; toggling only
+# picks the up/down string, and the browser runs the CSS transition.
+st.markdown(BALLOON_STYLE, unsafe_allow_html=True)
 st.markdown(
-    f"""
-    <div style="position: relative; height: 300px; border: 2px solid #ddd; border-radius: 10px;">
-        <div style="
-            position: absolute;
-            bottom: {bottom_position};
-            left: 50%;
-            transform: translateX(-50%);
-            width: 80px;
-            height: 100px;
-            background-color: red;
-            border-radius: 50%;
-            transition: bottom 0.6s ease-in-out;
-        ">
-        </div>
-    </div>
-    """,
+    BALLOON_HTML_UP if st.session_state.balloon_up else BALLOON_HTML_DOWN,
     unsafe_allow_html=True
 )
\ No newline at end of file
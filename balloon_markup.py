@@ -0,0 +1,33 @@
+"""Static balloon markup for UI_balloon.py.
+
+Streamlit re-executes UI_balloon.py on every rerun, but imported modules
+stay cached, so these strings are built once per server process.
+"""
+
+BALLOON_STYLE = """
+<style>
+.balloon-track {
+    position: relative;
+    height: 300px;
+    border: 2px solid #ddd;
+    border-radius: 10px;
+}
+.balloon {
+    position: absolute;
+    bottom: 20px;
+    left: 50%;
+    transform: translateX(-50%);
+    width: 80px;
+    height: 100px;
+    background-color: red;
+    border-radius: 50%;
+    transition: bottom 0.6s ease-in-out;
+}
+.balloon.up {
+    bottom: 250px;
+}
+</style>
+"""
+
+BALLOON_HTML_DOWN = '<div class="balloon-track"><div class="balloon"></div></div>'
+BALLOON_HTML_UP = '<div class="balloon-track"><div class="balloon up"></div></div>'
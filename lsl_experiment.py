@@ -8,11 +8,16 @@ active-state start/end boundaries only.
 from __future__ import annotations
 
 import argparse
+import gc
+import queue
 import random
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Literal
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal, NamedTuple
 
 try:
     import tkinter as tk
@@ -30,24 +35,51 @@ except ModuleNotFoundError as exc:
     ) from exc
 
 State = Literal["focus", "relaxation"]
-Line = tuple[str, tkfont.Font, str]
 
 MAX_RUN_LENGTH = 5
-MAX_SEQUENCE_ATTEMPTS = 5000
 DEFAULT_WINDOW_SIZE = (1280, 720)
+TAIL_WAIT_NS = 2_000_000
+LINE_POOL_SIZE = 6
+START_PROMPT_TAG = "start_prompt"
+CANVAS_RESIZED_EVENT = "<<CanvasResized>>"
+PHOTODIODE_SIZE = 80
 
 BG_COLOR = "#0A0E16"
 TEXT_COLOR = "#F2F6FC"
 ACCENT_COLOR = "#75D1FF"
 SUBTEXT_COLOR = "#AEB8C6"
+PHOTODIODE_ON_COLOR = "#FFFFFF"
+PHOTODIODE_OFF_COLOR = "#000000"
 
-@dataclass(slots=True, frozen=True)
-class Trial:
+class Trial(NamedTuple):
     state: State
     start_number: int | None = None
     subtractor: int | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class Session:
+    trials: list[Trial]
+    iti_durations: list[float]
+
+
+@dataclass(slots=True)
+class Scene:
+    texts: tuple[str, ...]
+    fonts: tuple[tkfont.Font, ...]
+    colors: tuple[str, ...]
+    positions: list[tuple[int, int]] = field(default_factory=list)
+    layout_size: tuple[int, int] = (0, 0)
+
+
+@dataclass(slots=True, frozen=True)
+class PreparedSession:
+    phase_scenes: tuple[Scene, ...]
+    phase_durations_ns: tuple[int, ...]
+    phase_start_markers: tuple[str | None, ...]
+    phase_end_markers: tuple[str | None, ...]
+
+
 @dataclass(slots=True, frozen=True)
 class Config:
     trials_per_state: int
@@ -57,6 +89,15 @@ class Config:
     initial_fixation: float
     fullscreen: bool
     seed: int | None
+    photodiode: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class MarkerOutlet:
+    outlet: StreamOutlet
+    pending: queue.SimpleQueue[tuple[float, str] | None]
+    sender: threading.Thread
+    log: list[str]
 
 
 class ExperimentAborted(Exception):
@@ -70,6 +111,11 @@ class TkUI:
     heading_font: tkfont.Font
     body_font: tkfont.Font
     subtext_font: tkfont.Font
+    linespaces: dict[str, int] = field(default_factory=dict)
+    line_items: tuple[int, ...] = ()
+    photodiode_item: int | None = None
+    canvas_size: tuple[int, int] = (1, 1)
+    line_spacing: int = 12
     abort_requested: bool = False
     abort_reason: str = "Aborted."
 
@@ -92,6 +138,11 @@ def parse_args(argv: list[str]) -> Config:
         action="store_false",
         help="Run in windowed mode (for development).",
     )
+    parser.add_argument(
+        "--photodiode",
+        action="store_true",
+        help="Flash a corner patch white during active trials for photodiode sync.",
+    )
     parser.add_argument(
         "--trials-per-state",
         type=int,
@@ -145,6 +196,7 @@ def parse_args(argv: list[str]) -> Config:
         initial_fixation=args.initial_fixation,
         fullscreen=args.fullscreen,
         seed=args.seed,
+        photodiode=args.photodiode,
     )
 
 
@@ -153,44 +205,34 @@ def build_state_sequence(
     trials_per_state: int,
     max_run_length: int = MAX_RUN_LENGTH,
 ) -> list[State]:
-    """Build balanced sequence with run-length limit."""
-    total_trials = trials_per_state * 2
-
-    for _ in range(MAX_SEQUENCE_ATTEMPTS):
-        remaining: dict[State, int] = {
-            "focus": trials_per_state,
-            "relaxation": trials_per_state,
-        }
-        sequence: list[State] = []
-        last_state: State | None = None
-        streak = 0
-
-        while len(sequence) < total_trials:
-            weighted_candidates: list[State] = []
-            for state in ("focus", "relaxation"):
-                count = remaining[state]
-                if count <= 0:
-                    continue
-                if state == last_state and streak >= max_run_length:
-                    continue
-                weighted_candidates.extend([state] * count)
-
-            if not weighted_candidates:
-                break
-
-            next_state = rng.choice(weighted_candidates)
-            sequence.append(next_state)
-            remaining[next_state] -= 1
-            if next_state == last_state:
-                streak += 1
-            else:
-                last_state = next_state
-                streak = 1
-
-        if len(sequence) == total_trials:
+    """Build balanced sequence with run-length limit.
+
+    Shuffles the balanced multiset, then breaks any over-long run by swapping
+    in the next trial of the other state. Reshuffles only if a run reaches the
+    end of the sequence with nothing left to swap in.
+    """
+    sequence: list[State] = ["focus"] * trials_per_state + ["relaxation"] * trials_per_state
+
+    while True:
+        rng.shuffle(sequence)
+        if _repair_runs(sequence, max_run_length):
             return sequence
 
-    raise RuntimeError("Failed to generate a valid trial sequence with run-length limit.")
+
+def _repair_runs(sequence: list[State], max_run_length: int) -> bool:
+    """Swap states in place so no run exceeds `max_run_length`; False if stuck."""
+    streak = 0
+    for i, state in enumerate(sequence):
+        streak = streak + 1 if i > 0 and state == sequence[i - 1] else 1
+        if streak <= max_run_length:
+            continue
+
+        j = next((k for k in range(i + 1, len(sequence)) if sequence[k] != state), None)
+        if j is None:
+            return False
+        sequence[i], sequence[j] = sequence[j], sequence[i]
+        streak = 1
+    return True
 
 
 def sample_subtraction_prompts(rng: random.Random, count: int) -> list[tuple[int, int]]:
@@ -205,12 +247,14 @@ def sample_subtraction_prompts(rng: random.Random, count: int) -> list[tuple[int
 
 def build_trials(rng: random.Random, trials_per_state: int) -> list[Trial]:
     sequence = build_state_sequence(rng, trials_per_state)
-    subtraction_prompts = iter(sample_subtraction_prompts(rng, trials_per_state))
+    subtraction_prompts = sample_subtraction_prompts(rng, trials_per_state)
+    prompt_index = 0
     trials: list[Trial] = []
 
     for state in sequence:
         if state == "focus":
-            start_number, subtractor = next(subtraction_prompts)
+            start_number, subtractor = subtraction_prompts[prompt_index]
+            prompt_index += 1
             trials.append(
                 Trial(state=state, start_number=start_number, subtractor=subtractor)
             )
@@ -220,7 +264,23 @@ def build_trials(rng: random.Random, trials_per_state: int) -> list[Trial]:
     return trials
 
 
-def create_lsl_outlet() -> StreamOutlet:
+def sample_iti_durations(rng: random.Random, config: Config, count: int) -> list[float]:
+    """Draw all ITI durations up front so no RNG work happens between trials."""
+    if config.iti_min == config.iti_max:
+        return [config.iti_min] * count
+    return [rng.uniform(config.iti_min, config.iti_max) for _ in range(count)]
+
+
+def build_session(rng: random.Random, config: Config) -> Session:
+    """Draw every random element of the session so `config.seed` fixes all of it."""
+    trials = build_trials(rng, config.trials_per_state)
+    return Session(
+        trials=trials,
+        iti_durations=sample_iti_durations(rng, config, len(trials) - 1),
+    )
+
+
+def create_lsl_outlet() -> MarkerOutlet:
     info = StreamInfo(
         name="EEGStateMarkers",
         type="Markers",
@@ -229,15 +289,43 @@ def create_lsl_outlet() -> StreamOutlet:
         channel_format="string",
         source_id=f"eeg_state_runner_{int(time.time())}",
     )
-    return StreamOutlet(info)
+    outlet = StreamOutlet(info)
+    pending: queue.SimpleQueue[tuple[float, str] | None] = queue.SimpleQueue()
+    log: list[str] = []
+    sender = threading.Thread(
+        target=_push_markers, args=(outlet, pending, log), name="lsl-markers", daemon=True
+    )
+    sender.start()
+    return MarkerOutlet(outlet=outlet, pending=pending, sender=sender, log=log)
+
 
+def _push_markers(
+    outlet: StreamOutlet,
+    pending: queue.SimpleQueue[tuple[float, str] | None],
+    log: list[str],
+) -> None:
+    while (item := pending.get()) is not None:
+        timestamp, marker = item
+        outlet.push_sample([marker], timestamp)
+        log.append(f"[LSL] {timestamp:.6f} {marker}\n")
 
-def send_marker(outlet: StreamOutlet, marker: str) -> None:
-    outlet.push_sample([marker], local_clock())
-    print(f"[LSL] {marker}")
 
+def close_lsl_outlet(outlet: MarkerOutlet) -> None:
+    """Flush queued markers, stop the sender thread, then print the marker log."""
+    outlet.pending.put(None)
+    outlet.sender.join()
+    sys.stdout.write("".join(outlet.log))
+    outlet.log.clear()
 
-def create_tk_ui(fullscreen: bool) -> TkUI:
+
+def send_marker(outlet: MarkerOutlet, marker: str, timestamp: float | None = None) -> None:
+    """Queue `marker` stamped at `timestamp` (default: now) for the sender thread."""
+    if timestamp is None:
+        timestamp = local_clock()
+    outlet.pending.put((timestamp, marker))
+
+
+def create_tk_ui(fullscreen: bool, photodiode: bool = False) -> TkUI:
     root = tk.Tk()
     root.title("EEG State Labeling")
     root.configure(bg=BG_COLOR)
@@ -248,91 +336,233 @@ def create_tk_ui(fullscreen: bool) -> TkUI:
 
     canvas = tk.Canvas(root, bg=BG_COLOR, highlightthickness=0, bd=0)
     canvas.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
     root.update()
 
+    canvas_w = max(canvas.winfo_width(), 1)
     canvas_h = max(canvas.winfo_height(), 1)
     heading_size = max(64, canvas_h // 8)
     body_size = max(36, canvas_h // 18)
     subtext_size = max(28, canvas_h // 24)
 
+    heading_font = tkfont.Font(root=root, family="TkDefaultFont", size=heading_size, weight="bold")
+    body_font = tkfont.Font(root=root, family="TkDefaultFont", size=body_size)
+    subtext_font = tkfont.Font(root=root, family="TkDefaultFont", size=subtext_size)
+
     ui = TkUI(
         root=root,
         canvas=canvas,
-        heading_font=tkfont.Font(root=root, family="TkDefaultFont", size=heading_size, weight="bold"),
-        body_font=tkfont.Font(root=root, family="TkDefaultFont", size=body_size),
-        subtext_font=tkfont.Font(root=root, family="TkDefaultFont", size=subtext_size),
+        heading_font=heading_font,
+        body_font=body_font,
+        subtext_font=subtext_font,
+        linespaces={
+            font.name: font.metrics("linespace")
+            for font in (heading_font, body_font, subtext_font)
+        },
+        line_items=tuple(
+            canvas.create_text(
+                0, 0, text="", justify=tk.CENTER, state=tk.HIDDEN, tags=f"line{index}"
+            )
+            for index in range(LINE_POOL_SIZE)
+        ),
+        canvas_size=(canvas_w, canvas_h),
+        line_spacing=max(12, canvas_h // 52),
     )
+    if photodiode:
+        ui.photodiode_item = canvas.create_rectangle(
+            canvas_w - PHOTODIODE_SIZE,
+            canvas_h - PHOTODIODE_SIZE,
+            canvas_w,
+            canvas_h,
+            fill=PHOTODIODE_OFF_COLOR,
+            outline="",
+        )
+
+    def handle_canvas_resize(event: tk.Event) -> None:
+        width, height = max(event.width, 1), max(event.height, 1)
+        ui.canvas_size = (width, height)
+        ui.line_spacing = max(12, height // 52)
+        if ui.photodiode_item is not None:
+            canvas.coords(
+                ui.photodiode_item,
+                width - PHOTODIODE_SIZE,
+                height - PHOTODIODE_SIZE,
+                width,
+                height,
+            )
+        canvas.event_generate(CANVAS_RESIZED_EVENT)
 
     def request_abort_escape(_event: tk.Event | None = None) -> None:
         ui.abort_requested = True
         ui.abort_reason = "Escape pressed."
+        root.quit()
 
     def request_abort_close() -> None:
         ui.abort_requested = True
         ui.abort_reason = "Window closed."
+        root.quit()
 
+    canvas.bind("<Configure>", handle_canvas_resize)
     root.bind("<Escape>", request_abort_escape)
     root.protocol("WM_DELETE_WINDOW", request_abort_close)
     return ui
 
 
-def pump_events(ui: TkUI) -> None:
+def schedule(ui: TkUI, duration_ms: int, next_step: Callable[[], None]) -> str:
+    return ui.root.after(max(0, duration_ms), next_step)
+
+
+def run_at(ui: TkUI, deadline_ns: int, callback: Callable[[], None]) -> None:
+    """Run `callback` from the Tk event loop once `time.perf_counter_ns()` hits `deadline_ns`.
+
+    The bulk of the wait is a single `after` timer; only the last
+    `TAIL_WAIT_NS` is re-checked with `after(0, ...)` for sub-ms precision.
+    Nothing is redrawn while waiting: the canvas only changes at phase
+    transitions.
+    """
+    remaining_ns = deadline_ns - time.perf_counter_ns()
+    if remaining_ns <= 0:
+        callback()
+    elif remaining_ns > TAIL_WAIT_NS:
+        schedule(
+            ui,
+            (remaining_ns - TAIL_WAIT_NS) // 1_000_000,
+            lambda: run_at(ui, deadline_ns, callback),
+        )
+    else:
+        schedule(ui, 0, lambda: run_at(ui, deadline_ns, callback))
+
+
+def run_mainloop(ui: TkUI) -> None:
+    """Run the Tk main loop until quit, then surface callback errors and aborts.
+
+    Tk normally prints callback exceptions and keeps looping, which would
+    leave the session frozen; instead the first one stops the loop and is
+    re-raised here.
+    """
+    errors: list[BaseException] = []
+
+    def stop_on_callback_error(
+        _exc_type: type[BaseException], exc: BaseException, _tb: object
+    ) -> None:
+        errors.append(exc)
+        ui.root.quit()
+
+    ui.root.report_callback_exception = stop_on_callback_error
     try:
-        ui.root.update_idletasks()
-        ui.root.update()
-    except tk.TclError as exc:
-        raise ExperimentAborted("Window closed.") from exc
+        ui.root.mainloop()
+    finally:
+        del ui.root.report_callback_exception
 
+    if errors:
+        raise errors[0]
     if ui.abort_requested:
         raise ExperimentAborted(ui.abort_reason)
 
 
-def wait_seconds(duration: float, ui: TkUI) -> None:
-    deadline = time.monotonic() + duration
-    while True:
-        pump_events(ui)
-        if time.monotonic() >= deadline:
-            return
-        time.sleep(0.01)
+def set_photodiode(ui: TkUI, on: bool) -> None:
+    """Flip the photodiode patch, if enabled; drawn on the next idle flush."""
+    if ui.photodiode_item is not None:
+        ui.canvas.itemconfigure(
+            ui.photodiode_item, fill=PHOTODIODE_ON_COLOR if on else PHOTODIODE_OFF_COLOR
+        )
 
 
-def draw_centered_lines(ui: TkUI, lines: list[Line]) -> None:
-    canvas_w = max(ui.canvas.winfo_width(), 1)
-    canvas_h = max(ui.canvas.winfo_height(), 1)
+def layout_scene(ui: TkUI, scene: Scene) -> None:
+    """Center `scene` on the canvas, unless it is already laid out for this size."""
+    if scene.layout_size == ui.canvas_size:
+        return
+    if len(scene.texts) > len(ui.line_items):
+        raise ValueError(f"At most {len(ui.line_items)} lines can be drawn at once.")
 
-    ui.canvas.delete("all")
-    ui.canvas.configure(bg=BG_COLOR)
+    canvas_w, canvas_h = ui.canvas_size
+    spacing = ui.line_spacing
 
-    line_heights = [font.metrics("linespace") for _, font, _ in lines]
-    spacing = max(12, canvas_h // 52)
-    total_height = sum(line_heights) + spacing * max(0, len(lines) - 1)
+    line_heights = [ui.linespaces[font.name] for font in scene.fonts]
+    total_height = sum(line_heights) + spacing * max(0, len(line_heights) - 1)
     y = (canvas_h - total_height) // 2
 
-    for (text, font, color), line_height in zip(lines, line_heights, strict=True):
-        ui.canvas.create_text(
-            canvas_w // 2,
-            y + (line_height // 2),
-            text=text,
-            fill=color,
-            font=font,
-            justify=tk.CENTER,
-        )
+    positions: list[tuple[int, int]] = []
+    for line_height in line_heights:
+        positions.append((canvas_w // 2, y + (line_height // 2)))
         y += line_height + spacing
 
-    pump_events(ui)
+    scene.positions = positions
+    scene.layout_size = ui.canvas_size
+
+
+def draw_centered_lines(ui: TkUI, scene: Scene) -> float:
+    """Show `scene` on the pre-created canvas text items, hiding spare slots.
+
+    Returns the LSL clock time right after the redraw was flushed.
+    """
+    layout_scene(ui, scene)
+
+    for text, font, color, (x, y), item in zip(
+        scene.texts, scene.fonts, scene.colors, scene.positions, ui.line_items
+    ):
+        ui.canvas.itemconfigure(item, text=text, fill=color, font=font, state=tk.NORMAL)
+        ui.canvas.coords(item, x, y)
+
+    for item in ui.line_items[len(scene.texts):]:
+        ui.canvas.itemconfigure(item, state=tk.HIDDEN)
+
+    # Flush the redraw so the returned timestamp lines up with the frame.
+    ui.root.update_idletasks()
+    return local_clock()
 
 
 def wait_for_start(ui: TkUI) -> None:
-    started = False
     button_bounds = (0, 0, 0, 0)
 
-    def draw_start_prompt() -> tuple[int, int, int, int]:
-        canvas_w = max(ui.canvas.winfo_width(), 1)
-        canvas_h = max(ui.canvas.winfo_height(), 1)
+    title_item = ui.canvas.create_text(
+        0,
+        0,
+        text="EEG State Labeling",
+        fill=TEXT_COLOR,
+        font=ui.heading_font,
+        justify=tk.CENTER,
+        tags=START_PROMPT_TAG,
+    )
+    body_item = ui.canvas.create_text(
+        0,
+        0,
+        text="Click Start to begin.",
+        fill=SUBTEXT_COLOR,
+        font=ui.body_font,
+        justify=tk.CENTER,
+        tags=START_PROMPT_TAG,
+    )
+    button_item = ui.canvas.create_rectangle(
+        0,
+        0,
+        0,
+        0,
+        fill=ACCENT_COLOR,
+        outline=ACCENT_COLOR,
+        width=2,
+        tags=START_PROMPT_TAG,
+    )
+    button_label_item = ui.canvas.create_text(
+        0,
+        0,
+        text="START",
+        fill=BG_COLOR,
+        font=ui.body_font,
+        justify=tk.CENTER,
+        tags=START_PROMPT_TAG,
+    )
+    hint_item = ui.canvas.create_text(
+        0,
+        0,
+        text="Press Enter/Space to start. Esc aborts.",
+        fill=SUBTEXT_COLOR,
+        font=ui.subtext_font,
+        justify=tk.CENTER,
+        tags=START_PROMPT_TAG,
+    )
 
-        ui.canvas.delete("all")
-        ui.canvas.configure(bg=BG_COLOR)
+    def layout_start_prompt() -> tuple[int, int, int, int]:
+        canvas_w, canvas_h = ui.canvas_size
 
         title_y = canvas_h * 0.30
         body_y = canvas_h * 0.42
@@ -343,52 +573,15 @@ def wait_for_start(ui: TkUI) -> None:
         button_x1 = button_x0 + button_w
         button_y1 = button_y0 + button_h
 
-        ui.canvas.create_text(
-            canvas_w // 2,
-            int(title_y),
-            text="EEG State Labeling",
-            fill=TEXT_COLOR,
-            font=ui.heading_font,
-            justify=tk.CENTER,
-        )
-        ui.canvas.create_text(
-            canvas_w // 2,
-            int(body_y),
-            text="Click Start to begin.",
-            fill=SUBTEXT_COLOR,
-            font=ui.body_font,
-            justify=tk.CENTER,
-        )
-        ui.canvas.create_rectangle(
-            button_x0,
-            button_y0,
-            button_x1,
-            button_y1,
-            fill=ACCENT_COLOR,
-            outline=ACCENT_COLOR,
-            width=2,
-        )
-        ui.canvas.create_text(
-            canvas_w // 2,
-            (button_y0 + button_y1) // 2,
-            text="START",
-            fill=BG_COLOR,
-            font=ui.body_font,
-            justify=tk.CENTER,
-        )
-        ui.canvas.create_text(
-            canvas_w // 2,
-            int(canvas_h * 0.74),
-            text="Press Enter/Space to start. Esc aborts.",
-            fill=SUBTEXT_COLOR,
-            font=ui.subtext_font,
-            justify=tk.CENTER,
-        )
+        ui.canvas.coords(title_item, canvas_w // 2, int(title_y))
+        ui.canvas.coords(body_item, canvas_w // 2, int(body_y))
+        ui.canvas.coords(button_item, button_x0, button_y0, button_x1, button_y1)
+        ui.canvas.coords(button_label_item, canvas_w // 2, (button_y0 + button_y1) // 2)
+        ui.canvas.coords(hint_item, canvas_w // 2, int(canvas_h * 0.74))
         return (button_x0, button_y0, button_x1, button_y1)
 
     def request_start(_event: tk.Event | None = None) -> None:
-        nonlocal started
-        started = True
+        ui.root.quit()
 
     def handle_click(event: tk.Event) -> None:
         x0, y0, x1, y1 = button_bounds
@@ -397,60 +590,169 @@ def wait_for_start(ui: TkUI) -> None:
 
     def handle_resize(_event: tk.Event) -> None:
         nonlocal button_bounds
-        button_bounds = draw_start_prompt()
+        button_bounds = layout_start_prompt()
 
     ui.root.bind("<Return>", request_start)
     ui.root.bind("<space>", request_start)
     ui.canvas.bind("<Button-1>", handle_click)
-    ui.root.bind("<Configure>", handle_resize)
+    ui.canvas.bind(CANVAS_RESIZED_EVENT, handle_resize)
 
     try:
-        button_bounds = draw_start_prompt()
-        pump_events(ui)
-        while not started:
-            pump_events(ui)
-            time.sleep(0.01)
+        button_bounds = layout_start_prompt()
+        run_mainloop(ui)
     finally:
         ui.root.unbind("<Return>")
         ui.root.unbind("<space>")
         ui.canvas.unbind("<Button-1>")
-        ui.root.unbind("<Configure>")
+        ui.canvas.unbind(CANVAS_RESIZED_EVENT)
+        ui.canvas.delete(START_PROMPT_TAG)
 
 
-def fixation_lines(
-    heading_font: tkfont.Font, body_font: tkfont.Font
-) -> list[Line]:
-    return [
-        ("+", heading_font, TEXT_COLOR),
-        ("Blink / reset", body_font, SUBTEXT_COLOR),
-    ]
+def fixation_scene(heading_font: tkfont.Font, body_font: tkfont.Font) -> Scene:
+    return Scene(
+        texts=("+", "Blink / reset"),
+        fonts=(heading_font, body_font),
+        colors=(TEXT_COLOR, SUBTEXT_COLOR),
+    )
 
 
-def focus_lines(
+def focus_scene(
     heading_font: tkfont.Font,
     body_font: tkfont.Font,
     start_number: int,
     subtractor: int,
-) -> list[Line]:
-    return [
-        ("FOCUS", heading_font, ACCENT_COLOR),
-        ("Repeat this subtraction in your mind.", body_font, TEXT_COLOR),
-        (f"Start: {start_number}", heading_font, TEXT_COLOR),
-        (f"Subtract: {subtractor}", body_font, SUBTEXT_COLOR),
-    ]
+) -> Scene:
+    return Scene(
+        texts=(
+            "FOCUS",
+            "Repeat this subtraction in your mind.",
+            f"Start: {start_number}",
+            f"Subtract: {subtractor}",
+        ),
+        fonts=(heading_font, body_font, heading_font, body_font),
+        colors=(ACCENT_COLOR, TEXT_COLOR, TEXT_COLOR, SUBTEXT_COLOR),
+    )
+
+
+def relaxation_scene(heading_font: tkfont.Font, body_font: tkfont.Font) -> Scene:
+    return Scene(
+        texts=("RELAX", "Relax. Breathe naturally."),
+        fonts=(heading_font, body_font),
+        colors=(ACCENT_COLOR, TEXT_COLOR),
+    )
+
+
+def prepare_session(config: Config, session: Session, ui: TkUI) -> PreparedSession:
+    """Flatten `session` into per-phase tuples: initial fixation, then trials and ITIs.
+
+    Scenes are built and laid out once here; fixation and relaxation share a
+    single scene across all trials.
+    """
+    fixation = fixation_scene(ui.heading_font, ui.body_font)
+    relaxation = relaxation_scene(ui.heading_font, ui.body_font)
+    scenes = [fixation]
+    durations = [config.initial_fixation]
+    start_markers: list[str | None] = [None]
+    end_markers: list[str | None] = [None]
+
+    for index, trial in enumerate(session.trials, start=1):
+        if trial.state == "focus":
+            # build_trials always fills the prompt for focus trials.
+            assert trial.start_number is not None and trial.subtractor is not None
+            scenes.append(
+                focus_scene(ui.heading_font, ui.body_font, trial.start_number, trial.subtractor)
+            )
+        else:
+            scenes.append(relaxation)
+        durations.append(config.active_duration)
+        start_markers.append(f"{trial.state}_start")
+        end_markers.append(f"{trial.state}_end")
+
+        if index < len(session.trials):
+            scenes.append(fixation)
+            durations.append(session.iti_durations[index - 1])
+            start_markers.append(None)
+            end_markers.append(None)
+
+    for scene in scenes:
+        layout_scene(ui, scene)
+
+    return PreparedSession(
+        phase_scenes=tuple(scenes),
+        phase_durations_ns=tuple(round(duration * 1e9) for duration in durations),
+        phase_start_markers=tuple(start_markers),
+        phase_end_markers=tuple(end_markers),
+    )
+
 
+def run_session(ui: TkUI, outlet: MarkerOutlet, prepared: PreparedSession) -> None:
+    """Step through `prepared` from Tk `after` callbacks until done or aborted.
+
+    Phase deadlines are accumulated in integer nanoseconds from a single
+    `perf_counter_ns` origin, so late wakeups are absorbed by the next delay
+    instead of drifting.
+    """
+    scenes = prepared.phase_scenes
+    durations_ns = prepared.phase_durations_ns
+    start_markers = prepared.phase_start_markers
+    end_markers = prepared.phase_end_markers
+    phase_count = len(scenes)
+    root = ui.root
+    has_photodiode = ui.photodiode_item is not None
+    deadline_ns = time.perf_counter_ns()
+
+    def start_phase(index: int) -> None:
+        nonlocal deadline_ns
+        if index == phase_count:
+            root.quit()
+            return
+
+        start_marker = start_markers[index]
+        if start_marker is not None:
+            # Keep cyclic GC pauses out of labeled trials; ITIs have the slack.
+            gc.disable()
+        if has_photodiode:
+            set_photodiode(ui, start_marker is not None)
+        onset = draw_centered_lines(ui, scenes[index])
+        if start_marker is not None:
+            send_marker(outlet, start_marker, onset)
+        else:
+            gc.collect()
+        deadline_ns += durations_ns[index]
+        run_at(ui, deadline_ns, lambda: end_phase(index))
+
+    def end_phase(index: int) -> None:
+        end_marker = end_markers[index]
+        if end_marker is not None:
+            offset = None
+            if has_photodiode:
+                set_photodiode(ui, False)
+                root.update_idletasks()
+                offset = local_clock()
+            send_marker(outlet, end_marker, offset)
+            gc.enable()
+        start_phase(index + 1)
 
-def relaxation_lines(heading_font: tkfont.Font, body_font: tkfont.Font) -> list[Line]:
-    return [
-        ("RELAX", heading_font, ACCENT_COLOR),
-        ("Relax. Breathe naturally.", body_font, TEXT_COLOR),
-    ]
+    try:
+        start_phase(0)
+        run_mainloop(ui)
+    finally:
+        gc.enable()
 
 
 def run_experiment(config: Config) -> int:
     rng = random.Random(config.seed)
-    trials = build_trials(rng, config.trials_per_state)
-    outlet = create_lsl_outlet()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Outlet setup never touches Tk, so it can overlap UI creation.
+        pending_outlet = executor.submit(create_lsl_outlet)
+        session = build_session(rng, config)
+        ui = create_tk_ui(config.fullscreen, config.photodiode)
+        try:
+            outlet = pending_outlet.result()
+        except BaseException:
+            ui.root.destroy()
+            raise
+
     print("[LSL] Outlet created: EEGStateMarkers")
     print(
         "[Session] Starting",
@@ -459,41 +761,18 @@ def run_experiment(config: Config) -> int:
         f"seed={config.seed}",
     )
 
-    ui = create_tk_ui(config.fullscreen)
-
     try:
+        # Lay out every scene now; layout_scene redoes any that a resize invalidates.
+        prepared = prepare_session(config, session, ui)
         wait_for_start(ui)
-        draw_centered_lines(ui, fixation_lines(ui.heading_font, ui.body_font))
-        wait_seconds(config.initial_fixation, ui)
-
-        for index, trial in enumerate(trials, start=1):
-            pump_events(ui)
-
-            if trial.state == "focus":
-                start_number = trial.start_number if trial.start_number is not None else 500
-                subtractor = trial.subtractor if trial.subtractor is not None else 7
-                draw_centered_lines(
-                    ui,
-                    focus_lines(ui.heading_font, ui.body_font, start_number, subtractor),
-                )
-                send_marker(outlet, "focus_start")
-                wait_seconds(config.active_duration, ui)
-                send_marker(outlet, "focus_end")
-            else:
-                draw_centered_lines(ui, relaxation_lines(ui.heading_font, ui.body_font))
-                send_marker(outlet, "relaxation_start")
-                wait_seconds(config.active_duration, ui)
-                send_marker(outlet, "relaxation_end")
-
-            if index < len(trials):
-                iti_duration = rng.uniform(config.iti_min, config.iti_max)
-                draw_centered_lines(ui, fixation_lines(ui.heading_font, ui.body_font))
-                wait_seconds(iti_duration, ui)
-
+        if not outlet.outlet.have_consumers():
+            print("[LSL] Warning: no consumer connected; markers may not be recorded.")
+        run_session(ui, outlet, prepared)
     except ExperimentAborted as exc:
         print(f"[Session] Aborted: {exc}")
         return 130
     finally:
+        close_lsl_outlet(outlet)
         try:
             ui.root.destroy()
         except tk.TclError: